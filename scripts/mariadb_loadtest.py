@@ -19,6 +19,9 @@ Quick Start:
     # Connection exhaustion test
     python mariadb_loadtest.py --workload connection_exhaustion --workers 200 --burst
 
+    # Thousands of connections from asyncio tasks (requires asyncmy or aiomysql)
+    python mariadb_loadtest.py --workload connection_exhaustion --workers 2000 --burst --async-driver
+
 Workloads:
     basic               - Simple queries, minimal metrics
     mixed               - Varied operations (DEFAULT)
@@ -29,9 +32,10 @@ Workloads:
     all_metrics         - Comprehensive coverage of ALL collectors
 
 Environment Variables:
-    DB_HOST, DB_PORT, DB_USER, DB_PASSWORD, DB_NAME
-    LT_WORKLOAD, LT_WORKERS, LT_HOLD, LT_BURST, LT_SINGLE_RUN
+    DB_HOST, DB_PORT, DB_SOCKET, DB_USER, DB_PASSWORD, DB_NAME
+    LT_WORKLOAD, LT_WORKERS, LT_HOLD, LT_BURST, LT_SINGLE_RUN, LT_QRT_BUCKETS, LT_SEED_ROWS
     LT_DURATION (default: 60), LT_STEP_SIZE (default: 10), LT_STEP_INTERVAL (default: 5)
+    LT_ASYNC_DRIVER (default: false; true/auto, asyncmy or aiomysql)
 
 Run --help for full options.
 """
@@ -39,29 +43,76 @@ Run --help for full options.
 from __future__ import annotations
 
 import argparse
+import array
 import asyncio
+import collections
 import concurrent.futures
+import contextlib
+import functools
+import inspect
+import itertools
 import os
+import queue
 import random
+import secrets
 import signal
 import sys
 import threading
 import time
 from dataclasses import dataclass
-from typing import Callable
+from typing import Callable, Generator, NamedTuple
 
 import mariadb
+from mariadb.constants import CLIENT
+
+# Optional async drivers for --async-driver; asyncmy mirrors aiomysql's API
+try:
+    import asyncmy
+    import asyncmy.errors
+except ImportError:
+    asyncmy = None
+
+try:
+    import aiomysql
+except ImportError:
+    aiomysql = None
+
+ASYNC_DRIVERS = {"asyncmy": asyncmy, "aiomysql": aiomysql}  # "auto" tries them in this order
+
+# Connection errors raised by whichever async driver is in use
+ASYNC_OPERATIONAL_ERRORS: tuple[type[Exception], ...] = tuple(
+    err for err in (asyncmy and asyncmy.errors.OperationalError, aiomysql and aiomysql.OperationalError) if err
+)
+
+try:
+    import numpy  # Optional: batches the workloads' random integers
+except ImportError:
+    numpy = None
+
+try:
+    import uvloop  # Optional: faster event loop for --async-driver
+except ImportError:
+    uvloop = None
 
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
 
+# query_response_time workload: (probability, SLEEP seconds) per iteration.
+# Defaults cover the exporter's default buckets (le 0.1 / 1.0 / 10.0).
+QRT_BUCKETS: tuple[tuple[float, float], ...] = (
+    (1.0, 0.2), (1.0, 0.5), (1.0, 0.8),  # 100ms-1s
+    (1.0, 2.0), (0.5, 5.0),              # 1s-10s
+    (0.2, 12.0),                         # >10s
+)
+
 @dataclass(frozen=True)
 class Config:
     """Test configuration."""
     # Connection
     host: str
     port: int
+    unix_socket: str | None  # Replaces host/port when set
     user: str
     password: str
     database: str
@@ -72,6 +123,8 @@ class Config:
     workers: int
     hold_time: float
     autocommit: bool
+    qrt_buckets: tuple[tuple[float, float], ...]
+    seed_rows: int
 
     # Execution mode
     burst_mode: bool
@@ -79,6 +132,7 @@ class Config:
     jitter_ms: int
     max_threads: int
     persistent: bool
+    async_driver: str | None  # "asyncmy", "aiomysql", or None for the thread pool
 
     # Duration mode (stepped ramp-up)
     duration: int
@@ -86,6 +140,20 @@ class Config:
     step_interval: int
 
 
+def parse_qrt_buckets(spec: str) -> tuple[tuple[float, float], ...]:
+    """Parse 'PROB:SECONDS,...' (e.g. '1:0.2,0.5:5') into query_response_time buckets."""
+    buckets = []
+    for item in spec.split(","):
+        try:
+            prob, seconds = (float(v) for v in item.split(":"))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid bucket '{item}', expected PROB:SECONDS")
+        if not 0.0 <= prob <= 1.0 or seconds < 0:
+            raise argparse.ArgumentTypeError(f"invalid bucket '{item}', need 0 <= PROB <= 1 and SECONDS >= 0")
+        buckets.append((prob, seconds))
+    return tuple(buckets)
+
+
 def parse_args() -> Config:
     """Parse command-line arguments and environment variables."""
     p = argparse.ArgumentParser(
@@ -111,6 +179,8 @@ Examples:
     conn = p.add_argument_group('Connection')
     conn.add_argument("--host", default=os.getenv("DB_HOST", "127.0.0.1"))
     conn.add_argument("--port", type=int, default=int(os.getenv("DB_PORT", "3306")))
+    conn.add_argument("--unix-socket", default=os.getenv("DB_SOCKET") or None,
+                      help="Connect through this Unix socket instead of host/port")
     conn.add_argument("--user", default=os.getenv("DB_USER", "root"))
     conn.add_argument("--password", default=os.getenv("DB_PASSWORD", "root"))
     conn.add_argument("--database", default=os.getenv("DB_NAME", "test"))
@@ -124,12 +194,18 @@ Examples:
         default=os.getenv("LT_WORKLOAD", "mixed"),
         help="Workload type (default: mixed). Use 'query_response_time' to test histogram buckets, 'all_metrics' for comprehensive testing."
     )
-    workload.add_argument("--workers", type=int, default=int(os.getenv("LT_WORKERS", "50")),
+    workload.add_argument("--workers", type=int, default=None,  # None = not given, resolved below
                          help="Number of concurrent workers (default: 50, auto-adjusts to 200 for connection_exhaustion)")
     workload.add_argument("--hold-time", type=float, default=float(os.getenv("LT_HOLD", "5")),
                          help="Seconds to hold each connection (default: 5)")
     workload.add_argument("--autocommit", action="store_true",
                          default=os.getenv("LT_AUTOCOMMIT", "false").lower() == "true")
+    workload.add_argument("--qrt-buckets", type=parse_qrt_buckets, default=os.getenv("LT_QRT_BUCKETS") or None,
+                         metavar="PROB:SECONDS,...",
+                         help="SLEEP buckets for the query_response_time workload (default: "
+                              + ",".join(f"{p:g}:{s:g}" for p, s in QRT_BUCKETS) + ")")
+    workload.add_argument("--seed-rows", type=int, default=int(os.getenv("LT_SEED_ROWS", "100000")),
+                         help="Rows to preload into an empty test_load so scans do real work (default: 100000, 0 to skip)")
 
     # Execution mode
     execution = p.add_argument_group('Execution')
@@ -145,6 +221,12 @@ Examples:
     execution.add_argument("--persistent", action="store_true",
                           default=os.getenv("LT_PERSISTENT", "false").lower() == "true",
                           help="Retry connections when max_connections reached (for observing connection limit behavior)")
+    env_async = os.getenv("LT_ASYNC_DRIVER", "false").lower()
+    execution.add_argument("--async-driver", nargs="?", const="auto", type=str.lower,
+                          choices=("auto", *ASYNC_DRIVERS),
+                          default={"false": None, "": None, "true": "auto"}.get(env_async, env_async),
+                          help="Run workers as asyncio tasks instead of a thread pool (ignores --max-threads); "
+                               "auto (the default when given without a value) prefers asyncmy over aiomysql")
 
     # Duration mode (default) or single-run mode
     duration_group = p.add_argument_group('Duration Mode (default: stepped ramp-up)')
@@ -160,27 +242,42 @@ Examples:
 
     args = p.parse_args()
 
+    # Resolve workers: --workers, then LT_WORKERS, then the workload default
+    workers = args.workers
+    if workers is None:
+        if "LT_WORKERS" in os.environ:
+            workers = int(os.environ["LT_WORKERS"])
+        elif args.workload == "connection_exhaustion":
+            workers = 200
+            print(f"[INFO] Auto-setting workers to {workers} for connection_exhaustion (override with --workers)")
+        else:
+            workers = 50
+
     # Validation
-    if args.workers <= 0 or args.max_threads <= 0:
+    if workers <= 0 or args.max_threads <= 0:
         p.error("--workers and --max-threads must be > 0")
 
+    async_driver = args.async_driver
+    if async_driver == "auto":
+        async_driver = next((name for name, mod in ASYNC_DRIVERS.items() if mod is not None), None)
+        if async_driver is None:
+            p.error("--async-driver requires asyncmy or aiomysql (pip install asyncmy)")
+    elif async_driver is not None:
+        if async_driver not in ASYNC_DRIVERS:
+            p.error(f"LT_ASYNC_DRIVER must be true, false, auto or one of: {', '.join(ASYNC_DRIVERS)}")
+        if ASYNC_DRIVERS[async_driver] is None:
+            p.error(f"--async-driver={async_driver} requires {async_driver} (pip install {async_driver})")
+
     # Apply single-run flag (overrides duration)
     duration = 0 if args.single_run else args.duration
 
     if duration > 0 and (args.step_size <= 0 or args.step_interval <= 0):
         p.error("--step-size and --step-interval must be > 0 when using --duration")
 
-    # Auto-adjust workers for connection exhaustion
-    workers = args.workers
-    if (args.workload == "connection_exhaustion" and
-        not any(a.startswith("--workers") for a in sys.argv) and
-        "LT_WORKERS" not in os.environ):
-        workers = 200
-        print(f"[INFO] Auto-setting workers to {workers} for connection_exhaustion (override with --workers)")
-
     return Config(
         host=args.host,
         port=args.port,
+        unix_socket=args.unix_socket,
         user=args.user,
         password=args.password,
         database=args.database,
@@ -189,340 +286,643 @@ Examples:
         workers=workers,
         hold_time=args.hold_time,
         autocommit=args.autocommit,
+        qrt_buckets=args.qrt_buckets or QRT_BUCKETS,
+        seed_rows=args.seed_rows,
         burst_mode=args.burst,
         ramp_ms=args.ramp_ms,
         jitter_ms=args.jitter_ms,
         max_threads=args.max_threads,
         persistent=args.persistent,
+        async_driver=async_driver,
         duration=duration,  # Use computed duration (respects --single-run)
         step_size=args.step_size,
         step_interval=args.step_interval,
     )
 
 
+# ============================================================================
+# LOGGING
+# ============================================================================
+
+# Worker log lines go through one writer thread so hundreds of workers do not
+# serialize on the stdout lock. A threading.Event in place of a line is a
+# flush marker, see flush_log().
+LOG_Q: queue.SimpleQueue = queue.SimpleQueue()
+LOG_BATCH = 256
+_LOG_WRITER: threading.Thread | None = None
+
+
+def log(msg: str, err: bool = False) -> None:
+    """Queue a line for the log writer (stderr when err is set)."""
+    LOG_Q.put((sys.stderr if err else sys.stdout, msg))
+
+
+def _write_lines(batch: list) -> None:
+    """Write a batch of queued lines, dropping any write error."""
+    for stream, msg in batch:
+        with contextlib.suppress(Exception):
+            if isinstance(msg, threading.Event):
+                sys.stdout.flush()
+                sys.stderr.flush()
+                msg.set()
+            else:
+                stream.write(msg + "\n")
+    with contextlib.suppress(Exception):
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+
+def _log_writer() -> None:
+    """Drain LOG_Q in batches for the life of the process."""
+    while True:
+        batch = [LOG_Q.get()]
+        with contextlib.suppress(queue.Empty):
+            while len(batch) < LOG_BATCH:
+                batch.append(LOG_Q.get_nowait())
+        _write_lines(batch)
+
+
+def start_log_writer() -> None:
+    """Start the background thread that drains LOG_Q."""
+    global _LOG_WRITER
+    _LOG_WRITER = threading.Thread(target=_log_writer, name="log-writer", daemon=True)
+    _LOG_WRITER.start()
+
+
+def flush_log() -> None:
+    """Block until every line queued so far has been written."""
+    done = threading.Event()
+    LOG_Q.put((None, done))
+    while _LOG_WRITER is not None and _LOG_WRITER.is_alive():
+        if done.wait(0.5):
+            return
+    # No writer to set done, so write whatever is queued from here
+    batch = []
+    with contextlib.suppress(queue.Empty):
+        while True:
+            batch.append(LOG_Q.get_nowait())
+    _write_lines(batch)
+
+
 # ============================================================================
 # DATABASE UTILITIES
 # ============================================================================
 
+def server_args(cfg: Config) -> dict:
+    """Where to reach the server: the Unix socket if given, else TCP host and port."""
+    if cfg.unix_socket:
+        return {"unix_socket": cfg.unix_socket}
+    return {"host": cfg.host, "port": cfg.port}
+
+
+def connect_args(cfg: Config) -> dict:
+    """Connection arguments shared by direct and pooled connections."""
+    return {
+        **server_args(cfg),
+        "user": cfg.user,
+        "password": cfg.password,
+        "database": cfg.database,
+        "connect_timeout": cfg.connect_timeout,
+        "autocommit": cfg.autocommit,
+    }
+
+
 def connect(cfg: Config) -> mariadb.Connection:
     """Create database connection."""
-    return mariadb.connect(
-        host=cfg.host,
-        user=cfg.user,
-        password=cfg.password,
-        database=cfg.database,
-        port=cfg.port,
-        connect_timeout=cfg.connect_timeout,
-        autocommit=cfg.autocommit,
-    )
+    return mariadb.connect(**connect_args(cfg))
+
 
+class PoolExhausted(Exception):
+    """Raised when a pool already has burst_limit connections open."""
 
-def get_max_connections(cfg: Config) -> int:
-    """Get MariaDB max_connections setting."""
+
+class ConnectionStrategy:
+    """How a ConnectionPool opens and closes its connections."""
+
+    def __init__(self, cfg: Config) -> None:
+        self.cfg = cfg
+
+    def make_connection(self) -> mariadb.Connection:
+        """Open a new connection for the pool."""
+        return connect(self.cfg)
+
+    def close_connection(self, conn: mariadb.Connection) -> None:
+        """Close a connection, ignoring errors from one already broken."""
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """Lock-free pool of idle connections for the threaded workers, built on atomic deque ops."""
+
+    def __init__(self, strategy: ConnectionStrategy, max_size: int, burst_limit: int) -> None:
+        self._strategy = strategy
+        self._max_size = max_size
+        self._burst_limit = burst_limit
+        # Starts empty so the stepped ramp-up still opens one connection per new
+        # worker; released sessions are kept as-is, autocommit and database included
+        self._idle: collections.deque[mariadb.Connection] = collections.deque()
+        self._slots = collections.deque([None] * burst_limit)  # One token per connection we may open
+        self._stmts: dict[mariadb.Connection, dict[str, mariadb.Cursor]] = {}
+
+    def acquire(self) -> mariadb.Connection:
+        """Pop an idle connection, or open a new one."""
+        try:
+            return self._idle.pop()
+        except IndexError:
+            pass
+        try:
+            self._slots.pop()
+        except IndexError:
+            raise PoolExhausted(f"pool reached burst_limit={self._burst_limit}") from None
+        try:
+            return self._strategy.make_connection()
+        except BaseException:
+            self._slots.append(None)
+            raise
+
+    def release(self, conn: mariadb.Connection) -> None:
+        """Keep a healthy connection for reuse, closing it if the pool is full."""
+        if len(self._idle) < self._max_size:
+            self._idle.append(conn)
+        else:
+            self.discard(conn)
+
+    def statements(self, conn: mariadb.Connection) -> dict[str, mariadb.Cursor]:
+        """Prepared cursors cached for conn, keyed by statement text."""
+        try:
+            return self._stmts[conn]
+        except KeyError:
+            stmts = self._stmts[conn] = {}
+            return stmts
+
+    def discard(self, conn: mariadb.Connection) -> None:
+        """Close a connection that must not be reused."""
+        self._stmts.pop(conn, None)
+        self._strategy.close_connection(conn)
+        self._slots.append(None)
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        while True:
+            try:
+                conn = self._idle.pop()
+            except IndexError:
+                return
+            self.discard(conn)
+
+
+def create_pool(cfg: Config) -> ConnectionPool:
+    """Create the worker connection pool."""
+    return ConnectionPool(ConnectionStrategy(cfg), max_size=cfg.max_threads, burst_limit=cfg.max_threads * 2)
+
+
+async def create_async_pool(cfg: Config) -> aiomysql.Pool:
+    """Create the asyncmy or aiomysql pool used by --async-driver workers."""
+    kwargs = {
+        "minsize": 0,
+        "maxsize": cfg.workers,
+        **server_args(cfg),
+        "user": cfg.user,
+        "password": cfg.password,
+        "connect_timeout": cfg.connect_timeout,
+        "autocommit": cfg.autocommit,
+    }
+    if cfg.async_driver == "asyncmy":
+        return await asyncmy.create_pool(database=cfg.database, **kwargs)
+    return await aiomysql.create_pool(db=cfg.database, **kwargs)
+
+
+# Database and tables the workloads need, sent to the server as one script
+_SQL_SCHEMA = """
+CREATE DATABASE IF NOT EXISTS `{db}` CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci;
+USE `{db}`;
+CREATE TABLE IF NOT EXISTS test_load (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    payload VARCHAR(255),
+    counter INT DEFAULT 0,
+    status VARCHAR(50),
+    INDEX idx_status (status),
+    INDEX idx_counter (counter)
+);
+CREATE TABLE IF NOT EXISTS test_metadata (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    data TEXT
+)
+"""
+
+_SQL_COUNT_TEST_TABLES = """
+    SELECT COUNT(*) FROM information_schema.TABLES
+    WHERE TABLE_SCHEMA = ? AND TABLE_NAME IN ('test_load', 'test_metadata')
+"""
+
+# max_connections per (host, port, socket, database) already bootstrapped in this process
+_BOOTSTRAPPED: dict[tuple[str, int, str | None, str], int] = {}
+
+
+def seed_test_load(cur: mariadb.Cursor, rows: int) -> None:
+    """Fill an empty test_load from the SEQUENCE engine's seq_1_to_N (first run only)."""
     try:
-        conn = connect(cfg)
-        cur = conn.cursor()
-        cur.execute("SHOW VARIABLES LIKE 'max_connections'")
-        result = cur.fetchone()
-        cur.close()
-        conn.close()
-        return int(result[1]) if result else 151
-    except Exception:
-        return 151
+        cur.execute("SELECT EXISTS(SELECT 1 FROM test_load)")
+        if cur.fetchone()[0]:
+            return
+        cur.execute(f"""
+            INSERT INTO test_load (payload, status, counter)
+            SELECT MD5(seq), ELT(1 + seq % 4, 'active', 'pending', 'processing', 'done'), 1 + seq % 1000
+            FROM seq_1_to_{int(rows)}
+        """)
+        print(f"[INIT] Seeded test_load with {rows} rows")
+    except Exception as e:  # Without SEQUENCE the workloads start from an empty table
+        print(f"[INIT] WARN could not seed test_load: {e}", file=sys.stderr)
 
 
-def ensure_database(cfg: Config) -> None:
-    """Create database if missing."""
+def bootstrap(cfg: Config) -> int:
+    """Create the database and test tables on one connection, returning max_connections."""
+    # Several tests in one process reuse the first result without reconnecting
+    key = (cfg.host, cfg.port, cfg.unix_socket, cfg.database)
+    if key in _BOOTSTRAPPED:
+        return _BOOTSTRAPPED[key]
+
+    # No default database, since it may not exist yet
     try:
         conn = mariadb.connect(
-            host=cfg.host, user=cfg.user, password=cfg.password,
-            port=cfg.port, connect_timeout=cfg.connect_timeout
+            **server_args(cfg), user=cfg.user, password=cfg.password,
+            connect_timeout=cfg.connect_timeout, autocommit=True,
+            client_flag=CLIENT.MULTI_STATEMENTS
         )
-        cur = conn.cursor()
-        safe_db = cfg.database.replace("`", "``")
-        cur.execute(f"CREATE DATABASE IF NOT EXISTS `{safe_db}` CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci")
-        conn.commit()
-        cur.close()
-        conn.close()
-        print(f"[INIT] Database ensured: {cfg.database}")
     except Exception as e:
-        print(f"[INIT] ERROR ensuring database: {e}", file=sys.stderr)
+        print(f"[INIT] ERROR connecting: {e}", file=sys.stderr)
         raise
 
+    with contextlib.closing(conn), contextlib.closing(conn.cursor()) as cur:
+        safe_db = cfg.database.replace("`", "``")
+        try:
+            cur.execute(_SQL_SCHEMA.format(db=safe_db))  # The whole schema in one round trip
+            while cur.nextset():  # Stops without raising at a failed statement
+                pass
+            # So check the result: a failed CREATE leaves its table missing
+            cur.execute(_SQL_COUNT_TEST_TABLES, (cfg.database,))
+            if cur.fetchone()[0] != 2:
+                raise RuntimeError("schema script did not create test_load and test_metadata")
+            print(f"[INIT] Database and test tables ensured: {cfg.database}")
+        except Exception as e:
+            print(f"[INIT] ERROR ensuring schema: {e}", file=sys.stderr)
+            raise
 
-def ensure_test_tables(cfg: Config) -> None:
-    """Create test tables."""
-    ensure_database(cfg)
-    try:
-        conn = connect(cfg)
-        cur = conn.cursor()
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS test_load (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                payload VARCHAR(255),
-                counter INT DEFAULT 0,
-                status VARCHAR(50),
-                INDEX idx_status (status),
-                INDEX idx_counter (counter)
-            )
-        """)
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS test_metadata (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                data TEXT
-            )
-        """)
-        conn.commit()
-        cur.close()
-        conn.close()
-        print("[INIT] Test tables ensured")
-    except Exception as e:
-        print(f"[INIT] ERROR ensuring tables: {e}", file=sys.stderr)
-        raise
+        if cfg.seed_rows > 0:
+            seed_test_load(cur, cfg.seed_rows)
+
+        try:
+            cur.execute("SELECT @@GLOBAL.max_connections")
+            result = cur.fetchone()
+            max_conns = int(result[0]) if result else 151
+        except Exception:
+            max_conns = 151  # The server default
+
+    _BOOTSTRAPPED[key] = max_conns
+    return max_conns
 
 
 # ============================================================================
 # WORKLOADS
 # ============================================================================
 
+# Pre-generated hex payloads for the lengths the workloads insert
+PAYLOAD_POOL_SIZE = 4096
+_PAYLOADS: dict[int, list[str]] = {
+    n: [secrets.token_hex(n // 2) for _ in range(PAYLOAD_POOL_SIZE)]
+    for n in (16, 32, 64, 128)
+}
+
+# With numpy, the rand_* helpers draw from a per-thread buffer of uniforms
+# that one vectorized call refills; without it each thread gets its own
+# random.Random. Either way threads never share generator state.
+RAND_BUFFER_SIZE = 1024
+_rng_local = threading.local()
+
+
+def _refill_uniforms() -> list[float]:
+    """Refill this thread's buffer of uniforms from its numpy Generator."""
+    local = _rng_local
+    rng = getattr(local, "rng", None)
+    if rng is None:
+        rng = local.rng = numpy.random.default_rng()  # Generators are not thread-safe
+    local.buf = buf = rng.random(RAND_BUFFER_SIZE).tolist()
+    return buf
+
+
+if numpy is not None:
+    def rand_float() -> float:
+        """Random float in [0, 1), like random.random."""
+        buf = getattr(_rng_local, "buf", None) or _refill_uniforms()
+        return buf.pop()
+
+    def rand_int(lo: int, hi: int) -> int:
+        """Random integer in [lo, hi], like random.randint."""
+        return lo + int(rand_float() * (hi - lo + 1))
+
+    def rand_uniform(a: float, b: float) -> float:
+        """Random float between a and b, like random.uniform."""
+        return a + (b - a) * rand_float()
+
+    def rand_choice(seq):
+        """Random element of a non-empty sequence, like random.choice."""
+        return seq[int(rand_float() * len(seq))]
+else:
+    def _thread_random() -> random.Random:
+        """This thread's random.Random, created on first use."""
+        rng = getattr(_rng_local, "rng", None)
+        if rng is None:
+            rng = _rng_local.rng = random.Random()
+        return rng
+
+    def rand_float() -> float:
+        """Random float in [0, 1), like random.random."""
+        return _thread_random().random()
+
+    def rand_int(lo: int, hi: int) -> int:
+        """Random integer in [lo, hi], like random.randint."""
+        return _thread_random().randint(lo, hi)
+
+    def rand_uniform(a: float, b: float) -> float:
+        """Random float between a and b, like random.uniform."""
+        return _thread_random().uniform(a, b)
+
+    def rand_choice(seq):
+        """Random element of a non-empty sequence, like random.choice."""
+        return _thread_random().choice(seq)
+
+# Status values the workloads pick from
+_STATUSES_3 = ('active', 'pending', 'done')
+_STATUSES_4 = ('active', 'pending', 'processing', 'done')
+_UPDATE_STATUSES = ('pending', 'active', 'processing')
+
+
 def rand_payload(n: int = 16) -> str:
-    """Generate random hex payload."""
-    return "".join(random.choice("abcdef0123456789") for _ in range(n))
+    """Random hex payload of a pooled length (KeyError for any other n)."""
+    return rand_choice(_PAYLOADS[n])
+
+
+# Statements shared by the workloads. Reusing the exact same text lets the
+# prepared cursor keep its server-side handle instead of re-parsing.
+_SQL_SELECT_1 = "SELECT 1"
+_SQL_ADD = "SELECT ? + ?"
+_SQL_DO_ADD = "DO ? + ?"  # Same arithmetic without a result set to fetch
+_SQL_SLEEP = "SELECT SLEEP(?)"
+_SQL_DO_SLEEP = "DO SLEEP(?)"  # Server-side pause that returns no result set
+_SQL_BEGIN_READ_ONLY = "START TRANSACTION READ ONLY"
+
+# metadata: rewriting the table comment is a metadata-only ALTER. It still
+# queues for the exclusive metadata lock behind open transactions, yet it
+# cannot fail on a concurrent worker's change and leaves nothing to clean up.
+# The text is fixed so every run sends the same statement.
+_SQL_SET_COMMENT = "ALTER TABLE test_metadata COMMENT = 'mariadb_loadtest'"
+_SQL_INSERT_PAYLOAD = "INSERT INTO test_load (payload, status) VALUES (?, ?)"
+_SQL_INSERT_LOAD = "INSERT INTO test_load (payload, status, counter) VALUES (?, ?, ?)"
+
+
+def multi_row_insert(sql: str, rows: int) -> str:
+    """Repeat the VALUES tuple of a single-row INSERT so one statement writes `rows` rows."""
+    head, values = sql.split(" VALUES ")
+    return f"{head} VALUES {', '.join([values] * rows)}"
+
+
+# Batched inserts: one statement (and one prepared handle) per batch size
+_SQL_INSERT_LOAD_5 = multi_row_insert(_SQL_INSERT_LOAD, 5)  # stress
+_SQL_INSERT_LOAD_3 = multi_row_insert(_SQL_INSERT_LOAD, 3)  # all_metrics
+_SQL_BUMP_COUNTER = "UPDATE test_load SET counter = counter + 1 WHERE counter = ? LIMIT 1"
+
+# connection_exhaustion: all three counters in one round trip
+_SQL_CONN_STATS = """
+    SELECT VARIABLE_NAME, VARIABLE_VALUE FROM information_schema.GLOBAL_STATUS
+    WHERE VARIABLE_NAME IN ('Threads_connected', 'Max_used_connections')
+    UNION ALL
+    SELECT VARIABLE_NAME, VARIABLE_VALUE FROM information_schema.GLOBAL_VARIABLES
+    WHERE VARIABLE_NAME = 'max_connections'
+"""
 
 
-def workload_basic(cur: mariadb.Cursor, conn: mariadb.Connection, cfg: Config) -> None:
-    """Basic workload: simple queries."""
-    payload = rand_payload(16)
-    cur.execute("INSERT INTO test_load (payload, status) VALUES (?, 'active')", (payload,))
+# all_metrics: one medium query always, a slow one 30% of the time
+ALL_METRICS_BUCKETS: tuple[tuple[float, float], ...] = ((1.0, 0.3), (0.3, 2.0))
+
+
+# A workload is a generator of Steps, written once and run by either driver:
+# run_workload() on the threaded pool, run_async_workload() under
+# --async-driver. The driver sends each statement's result back in at the
+# yield, and throws a database error in at the yield that caused it.
+class Step(NamedTuple):
+    """One statement of a workload and how to read its result."""
+    sql: str
+    params: tuple | list | None = None
+    fetch: str | None = None  # "fetchone", "fetchall", "drain", or None for no result
+
+
+BEGIN = Step("BEGIN")    # conn.begin()
+COMMIT = Step("COMMIT")  # commit(), a no-op under --autocommit
+
+Workload = Generator[Step, object, None]
+
+# Errors workloads ignore as replication or lock conflicts, on either driver
+OPERATIONAL_ERRORS: tuple[type[Exception], ...] = (mariadb.OperationalError, *ASYNC_OPERATIONAL_ERRORS)
+
+
+def log_conn_stats(rows: list[tuple]) -> None:
+    """Log the _SQL_CONN_STATS rows (information_schema names are upper case)."""
+    stats = {name.upper(): value for name, value in rows}
+    if len(stats) == 3:
+        log(f"[CONN] Threads: {stats['THREADS_CONNECTED']} | Max used: {stats['MAX_USED_CONNECTIONS']} "
+            f"| Limit: {stats['MAX_CONNECTIONS']}")
+
+
+def commit(conn: mariadb.Connection, cfg: Config) -> None:
+    """Commit unless autocommit is enabled, rolling back on conflicts."""
     if not cfg.autocommit:
         try:
             conn.commit()
         except mariadb.OperationalError:
             conn.rollback()
 
+
+def sleep_buckets(buckets: tuple[tuple[float, float], ...]) -> Workload:
+    """Run SELECT SLEEP(seconds) with the given probability for each bucket."""
+    for prob, seconds in buckets:
+        if rand_float() < prob:
+            yield Step(_SQL_SLEEP, (seconds,), "fetchone")
+
+
+def workload_basic(cfg: Config) -> Workload:
+    """Basic workload: simple queries."""
+    payload = rand_payload(16)
+    yield Step(_SQL_INSERT_PAYLOAD, (payload, 'active'))
+    yield COMMIT
+
     for _ in range(3):
-        a, b = random.randint(1, 1000), random.randint(1, 1000)
-        cur.execute("SELECT ? + ?", (a, b))
-        _ = cur.fetchone()
-        time.sleep(0.05)
+        a, b = rand_int(1, 1000), rand_int(1, 1000)
+        yield Step(_SQL_DO_ADD, (a, b))
+        yield Step(_SQL_DO_SLEEP, (0.05,))
 
 
-def workload_mixed(cur: mariadb.Cursor, conn: mariadb.Connection, cfg: Config) -> None:
+def workload_mixed(cfg: Config) -> Workload:
     """Mixed workload: varied operations."""
     # Fast query
-    cur.execute("SELECT 1")
-    _ = cur.fetchone()
+    yield Step(_SQL_SELECT_1, fetch="fetchone")
 
     # INSERT (no contention)
     payload = rand_payload(32)
-    cur.execute("INSERT INTO test_load (payload, status, counter) VALUES (?, ?, ?)",
-                (payload, random.choice(['active', 'pending', 'done']), random.randint(1, 100)))
+    yield Step(_SQL_INSERT_LOAD, (payload, rand_choice(_STATUSES_3), rand_int(1, 100)))
 
     # SELECT with index (no locks)
-    cur.execute("SELECT * FROM test_load WHERE status = 'active' LIMIT 10")
-    _ = cur.fetchall()
+    yield Step("SELECT * FROM test_load WHERE status = 'active' LIMIT 10", fetch="drain")
 
     # Full table scan (slow, but no locks)
-    cur.execute("SELECT COUNT(*) FROM test_load WHERE payload LIKE '%abc%'")
-    _ = cur.fetchone()
+    yield Step("SELECT SQL_NO_CACHE COUNT(*) FROM test_load WHERE payload LIKE '%abc%'", fetch="fetchone")
 
     # UPDATE - use random counter to spread contention (wrapped in try/except for replication conflicts)
     try:
-        random_counter = random.randint(1, 1000)
-        cur.execute("UPDATE test_load SET counter = counter + 1 WHERE counter = ? LIMIT 1", (random_counter,))
-    except mariadb.OperationalError:
+        random_counter = rand_int(1, 1000)
+        yield Step(_SQL_BUMP_COUNTER, (random_counter,))
+    except OPERATIONAL_ERRORS:
         pass  # Ignore replication conflicts
 
     # Sort + GROUP BY (temp table, no locks)
-    cur.execute("SELECT status, COUNT(*) FROM test_load GROUP BY status")
-    _ = cur.fetchall()
+    yield Step("SELECT SQL_NO_CACHE status, COUNT(*) FROM test_load GROUP BY status", fetch="drain")
 
     # DELETE - use specific counter to reduce contention (wrapped in try/except)
     try:
-        delete_counter = random.randint(1, 50)
-        cur.execute("DELETE FROM test_load WHERE status = 'done' AND counter < ? LIMIT 1", (delete_counter,))
-    except mariadb.OperationalError:
+        delete_counter = rand_int(1, 50)
+        yield Step("DELETE FROM test_load WHERE status = 'done' AND counter < ? LIMIT 1", (delete_counter,))
+    except OPERATIONAL_ERRORS:
         pass  # Ignore replication conflicts
 
-    if not cfg.autocommit:
-        try:
-            conn.commit()
-        except mariadb.OperationalError:
-            conn.rollback()
+    yield COMMIT
 
 
-def workload_stress(cur: mariadb.Cursor, conn: mariadb.Connection, cfg: Config) -> None:
+def workload_stress(cfg: Config) -> Workload:
     """Stress workload: complex queries, intentional slow queries."""
-    # Multiple inserts (no contention)
-    for _ in range(5):
-        payload = rand_payload(64)
-        cur.execute("INSERT INTO test_load (payload, status, counter) VALUES (?, ?, ?)",
-                    (payload, random.choice(['active', 'pending', 'processing', 'done']),
-                     random.randint(1, 1000)))
+    # The reads run first as one READ ONLY transaction so InnoDB skips
+    # transaction ID and undo allocation for them
+    if not cfg.autocommit:
+        yield Step(_SQL_BEGIN_READ_ONLY)
 
     # Complex aggregation (no locks)
-    cur.execute("""
-        SELECT status, COUNT(*) as cnt, AVG(counter) as avg_counter
+    yield Step("""
+        SELECT SQL_NO_CACHE status, COUNT(*) as cnt, AVG(counter) as avg_counter
         FROM test_load
         GROUP BY status
         HAVING cnt > 0
         ORDER BY cnt DESC
-    """)
-    _ = cur.fetchall()
+    """, fetch="drain")
 
     # Subquery (no locks)
-    cur.execute("""
-        SELECT * FROM test_load
+    yield Step("""
+        SELECT SQL_NO_CACHE * FROM test_load
         WHERE counter > (SELECT AVG(counter) FROM test_load)
         LIMIT 10
-    """)
-    _ = cur.fetchall()
+    """, fetch="drain")
 
     # Intentional slow query (exercises slow_queries metric)
-    slow_duration = random.uniform(0.5, 1.2)
-    cur.execute("SELECT SLEEP(?)", (slow_duration,))
-    _ = cur.fetchone()
+    slow_duration = rand_uniform(0.5, 1.2)
+    yield Step(_SQL_SLEEP, (slow_duration,), "fetchone")
 
     # Large result set (no locks)
-    cur.execute("SELECT * FROM test_load WHERE counter > 0 ORDER BY created_at DESC LIMIT 1000")
-    _ = cur.fetchall()
+    yield Step("SELECT SQL_NO_CACHE * FROM test_load WHERE counter > 0 ORDER BY created_at DESC LIMIT 1000",
+               fetch="drain")
 
     # Cross join with LIMIT (exercises buffer pool without excessive locks)
     # Use specific counter range to reduce contention
-    counter_min = random.randint(1, 500)
+    counter_min = rand_int(1, 500)
     counter_max = counter_min + 100
-    cur.execute("""
-        SELECT COUNT(*)
+    yield Step("""
+        SELECT SQL_NO_CACHE COUNT(*)
         FROM (SELECT * FROM test_load WHERE counter BETWEEN ? AND ? LIMIT 50) t1,
              (SELECT * FROM test_load WHERE counter BETWEEN ? AND ? LIMIT 50) t2
         WHERE t1.counter = t2.counter
-    """, (counter_min, counter_max, counter_min, counter_max))
-    _ = cur.fetchone()
+    """, (counter_min, counter_max, counter_min, counter_max), "fetchone")
+    yield COMMIT
+
+    # Multiple rows in one INSERT (no contention); it and the updates below
+    # share one read-write transaction and a single durable commit
+    rows = [(rand_payload(64), rand_choice(_STATUSES_4),
+             rand_int(1, 1000)) for _ in range(5)]
+    yield Step(_SQL_INSERT_LOAD_5, list(itertools.chain.from_iterable(rows)))
 
     # Updates with specific targeting to reduce contention (wrapped in try/except)
     try:
-        random_status = random.choice(['pending', 'active', 'processing'])
-        random_counter = random.randint(1, 1000)
-        cur.execute("UPDATE test_load SET status = 'processing' WHERE status = ? AND counter = ? LIMIT 1",
-                    (random_status, random_counter))
-        cur.execute("UPDATE test_load SET counter = counter + 1 WHERE counter BETWEEN ? AND ? LIMIT 1",
-                    (random_counter, random_counter + 10))
-    except mariadb.OperationalError:
+        random_status = rand_choice(_UPDATE_STATUSES)
+        random_counter = rand_int(1, 1000)
+        yield Step("UPDATE test_load SET status = 'processing' WHERE status = ? AND counter = ? LIMIT 1",
+                   (random_status, random_counter))
+        yield Step("UPDATE test_load SET counter = counter + 1 WHERE counter BETWEEN ? AND ? LIMIT 1",
+                   (random_counter, random_counter + 10))
+    except OPERATIONAL_ERRORS:
         pass  # Ignore replication conflicts
 
-    if not cfg.autocommit:
-        try:
-            conn.commit()
-        except mariadb.OperationalError:
-            conn.rollback()
+    yield COMMIT
 
 
-def workload_metadata(cur: mariadb.Cursor, conn: mariadb.Connection, cfg: Config) -> None:
+def workload_metadata(cfg: Config) -> Workload:
     """Metadata workload: locks and DDL."""
     if not cfg.autocommit:
-        cur.execute("START TRANSACTION")
+        yield BEGIN
 
-    cur.execute("SELECT * FROM test_metadata LIMIT 1")
-    _ = cur.fetchall()
-    time.sleep(random.uniform(0.5, 2.0))
+    yield Step("SELECT * FROM test_metadata LIMIT 1", fetch="drain")
+    # Pause inside the session so the open transaction keeps its locks
+    yield Step(_SQL_DO_SLEEP, (rand_uniform(0.5, 2.0),))
 
     # DDL operation (30% chance)
-    if random.random() < 0.3:
-        try:
-            cur.execute("ALTER TABLE test_metadata ADD COLUMN temp_col VARCHAR(10)")
-            cur.execute("ALTER TABLE test_metadata DROP COLUMN temp_col")
-        except Exception:
-            pass
+    if rand_float() < 0.3:
+        yield Step(_SQL_SET_COMMENT)
 
     payload = rand_payload(128)
-    cur.execute("INSERT INTO test_load (payload, status) VALUES (?, 'locked')", (payload,))
-    time.sleep(random.uniform(0.5, 1.5))
+    yield Step(_SQL_INSERT_PAYLOAD, (payload, 'locked'))
+    yield Step(_SQL_DO_SLEEP, (rand_uniform(0.5, 1.5),))
 
-    if not cfg.autocommit:
-        try:
-            conn.commit()
-        except mariadb.OperationalError:
-            conn.rollback()
+    yield COMMIT
 
 
-def workload_connection_exhaustion(cur: mariadb.Cursor, conn: mariadb.Connection, cfg: Config) -> None:
+def workload_connection_exhaustion(cfg: Config) -> Workload:
     """Connection exhaustion: hold connections with minimal work."""
-    cur.execute("SHOW STATUS LIKE 'Threads_connected'")
-    threads_connected = cur.fetchone()
-    cur.execute("SHOW STATUS LIKE 'Max_used_connections'")
-    max_used = cur.fetchone()
-    cur.execute("SHOW VARIABLES LIKE 'max_connections'")
-    max_connections = cur.fetchone()
-
-    if threads_connected and max_used and max_connections:
-        print(f"[CONN] Threads: {threads_connected[1]} | Max used: {max_used[1]} | Limit: {max_connections[1]}")
+    log_conn_stats((yield Step(_SQL_CONN_STATS, fetch="fetchall")))
 
-    # Keep connection alive
-    for _ in range(int(cfg.hold_time)):
-        cur.execute("SELECT 1")
-        _ = cur.fetchone()
-        time.sleep(1)
+    # Keep connection busy for hold_time with one server-side SLEEP
+    yield Step(_SQL_SLEEP, (cfg.hold_time,), "fetchone")
 
 
-def workload_query_response_time(cur: mariadb.Cursor, conn: mariadb.Connection, cfg: Config) -> None:
+def workload_query_response_time(cfg: Config) -> Workload:
     """
     Query response time workload: generates queries in all histogram buckets.
 
-    Bucket coverage:
+    Bucket coverage (default QRT_BUCKETS, override with --qrt-buckets):
     - le="0.1": Queries 100ms-1s (200ms, 500ms, 800ms)
-    - le="1.0": Queries 1s-10s (2s, 5s)
-    - le="10.0": Queries >10s (12s)
+    - le="1.0": Queries 1s-10s (2s, 50% chance of 5s)
+    - le="10.0": Queries >10s (20% chance of 12s)
     - Fast queries <100ms (not in buckets, but in _count and _sum)
     """
     # Enable query_response_time if needed
     try:
-        cur.execute("SET GLOBAL query_response_time_stats = ON")
+        yield Step("SET GLOBAL query_response_time_stats = ON")
     except Exception:
         pass  # May not have permission or plugin not available
 
     # Fast queries (< 100ms) - appear in _count and _sum but not buckets
     for _ in range(3):
-        cur.execute("SELECT 1")
-        _ = cur.fetchone()
-        cur.execute("SELECT ? + ?", (random.randint(1, 100), random.randint(1, 100)))
-        _ = cur.fetchone()
-
-    # Bucket le="0.1" (100ms-1s)
-    cur.execute("SELECT SLEEP(0.2)")  # 200ms
-    _ = cur.fetchone()
-
-    cur.execute("SELECT SLEEP(0.5)")  # 500ms
-    _ = cur.fetchone()
+        yield Step(_SQL_SELECT_1, fetch="fetchone")
+        yield Step(_SQL_ADD, (rand_int(1, 100), rand_int(1, 100)), "fetchone")
 
-    cur.execute("SELECT SLEEP(0.8)")  # 800ms
-    _ = cur.fetchone()
-
-    # Bucket le="1.0" (1s-10s)
-    cur.execute("SELECT SLEEP(2)")  # 2s
-    _ = cur.fetchone()
-
-    if random.random() < 0.5:  # 50% chance for 5s query
-        cur.execute("SELECT SLEEP(5)")  # 5s
-        _ = cur.fetchone()
-
-    # Bucket le="10.0" (>10s) - less frequent to avoid excessive slowness
-    if random.random() < 0.2:  # 20% chance for very slow query
-        cur.execute("SELECT SLEEP(12)")  # 12s
-        _ = cur.fetchone()
+    # Histogram buckets (slow ones are probabilistic to avoid excessive slowness)
+    yield from sleep_buckets(cfg.qrt_buckets)
 
     # Some data manipulation to make it realistic
     payload = rand_payload(32)
-    cur.execute("INSERT INTO test_load (payload, status) VALUES (?, 'test')", (payload,))
+    yield Step(_SQL_INSERT_PAYLOAD, (payload, 'test'))
 
-    if not cfg.autocommit:
-        try:
-            conn.commit()
-        except mariadb.OperationalError:
-            conn.rollback()
+    yield COMMIT
 
 
-def workload_all_metrics(cur: mariadb.Cursor, conn: mariadb.Connection, cfg: Config) -> None:
+def workload_all_metrics(cfg: Config) -> Workload:
     """
     Comprehensive workload that exercises ALL metrics from all collectors.
 
@@ -537,81 +937,67 @@ def workload_all_metrics(cur: mariadb.Cursor, conn: mariadb.Connection, cfg: Con
     # === PART 1: Query response time bucket testing ===
     # Fast queries (< 100ms) - appear in _count/_sum but not buckets
     for _ in range(2):
-        cur.execute("SELECT 1")
-        _ = cur.fetchone()
+        yield Step(_SQL_SELECT_1, fetch="fetchone")
 
-    cur.execute("SELECT ? + ?", (random.randint(1, 100), random.randint(1, 100)))
-    _ = cur.fetchone()
+    yield Step(_SQL_ADD, (rand_int(1, 100), rand_int(1, 100)), "fetchone")
 
-    # Medium query: le="0.1" bucket (100ms-1s)
-    cur.execute("SELECT SLEEP(0.3)")  # 300ms
-    _ = cur.fetchone()
-
-    # Slow query: le="1.0" bucket (1s-10s) - 30% chance
-    if random.random() < 0.3:
-        cur.execute("SELECT SLEEP(2)")  # 2s
-        _ = cur.fetchone()
+    # Medium query: le="0.1" bucket (100ms-1s), slow query: le="1.0" bucket (1s-10s)
+    yield from sleep_buckets(ALL_METRICS_BUCKETS)
 
     # === PART 2: Data manipulation (com_insert, com_update, com_delete, schema) ===
     # INSERT - exercises: com_insert, table rows, table size (no contention)
-    for _ in range(3):
-        payload = rand_payload(128)
-        cur.execute("INSERT INTO test_load (payload, status, counter) VALUES (?, ?, ?)",
-                    (payload, random.choice(['active', 'pending', 'done']), random.randint(1, 500)))
+    rows = [(rand_payload(128), rand_choice(_STATUSES_3), rand_int(1, 500))
+            for _ in range(3)]
+    yield Step(_SQL_INSERT_LOAD_3, list(itertools.chain.from_iterable(rows)))
 
     # SELECT - exercises: com_select, table_locks_immediate (no locks)
-    cur.execute("SELECT * FROM test_load WHERE status = 'active' LIMIT 20")
-    _ = cur.fetchall()
+    yield Step("SELECT * FROM test_load WHERE status = 'active' LIMIT 20", fetch="drain")
 
     # UPDATE - exercises: com_update, innodb_row_lock_* (targeted to reduce contention)
     try:
-        update_counter = random.randint(1, 500)
-        cur.execute("UPDATE test_load SET counter = counter + 1 WHERE counter = ? LIMIT 1", (update_counter,))
-    except mariadb.OperationalError:
+        update_counter = rand_int(1, 500)
+        yield Step(_SQL_BUMP_COUNTER, (update_counter,))
+    except OPERATIONAL_ERRORS:
         pass  # Ignore replication conflicts
 
     # DELETE - exercises: com_delete (specific targeting)
     try:
-        delete_counter = random.randint(400, 500)
-        cur.execute("DELETE FROM test_load WHERE status = 'done' AND counter = ? LIMIT 1", (delete_counter,))
-    except mariadb.OperationalError:
+        delete_counter = rand_int(400, 500)
+        yield Step("DELETE FROM test_load WHERE status = 'done' AND counter = ? LIMIT 1", (delete_counter,))
+    except OPERATIONAL_ERRORS:
         pass  # Ignore replication conflicts
 
     # === PART 3: Slow queries (query_response_time: > 0.5s, slow_queries) ===
     # Intentional slow query
-    cur.execute("SELECT SLEEP(0.6)")
-    _ = cur.fetchone()
+    yield Step("SELECT SLEEP(0.6)", fetch="fetchone")
 
     # Large scan (query_response_time: 0.1-0.5s)
-    cur.execute("SELECT COUNT(*) FROM test_load WHERE payload LIKE '%a%'")
-    _ = cur.fetchone()
+    yield Step("SELECT SQL_NO_CACHE COUNT(*) FROM test_load WHERE payload LIKE '%a%'", fetch="fetchone")
 
     # === PART 4: Complex queries (statements, buffer pool) ===
     # Aggregation with GROUP BY (temporary tables, no locks)
-    cur.execute("""
-        SELECT status, COUNT(*) as cnt, MIN(counter), MAX(counter), AVG(counter)
+    yield Step("""
+        SELECT SQL_NO_CACHE status, COUNT(*) as cnt, MIN(counter), MAX(counter), AVG(counter)
         FROM test_load
         GROUP BY status
         ORDER BY cnt DESC
-    """)
-    _ = cur.fetchall()
+    """, fetch="drain")
 
     # Subquery (exercises buffer pool, nested queries, no locks)
-    cur.execute("""
-        SELECT * FROM test_load
+    yield Step("""
+        SELECT SQL_NO_CACHE * FROM test_load
         WHERE counter > (SELECT AVG(counter) FROM test_load)
         ORDER BY created_at DESC
         LIMIT 15
-    """)
-    _ = cur.fetchall()
+    """, fetch="drain")
 
     # Self-join (exercises buffer pool, join operations)
     # Use limited subqueries to reduce contention and avoid deadlocks
     try:
-        counter_range_start = random.randint(1, 400)
+        counter_range_start = rand_int(1, 400)
         counter_range_end = counter_range_start + 50
-        cur.execute("""
-            SELECT t1.status, COUNT(*)
+        yield Step("""
+            SELECT SQL_NO_CACHE t1.status, COUNT(*)
             FROM (SELECT status, counter FROM test_load
                   WHERE counter BETWEEN ? AND ? LIMIT 30) t1
             JOIN (SELECT status, counter FROM test_load
@@ -619,45 +1005,37 @@ def workload_all_metrics(cur: mariadb.Cursor, conn: mariadb.Connection, cfg: Con
                 ON t1.counter = t2.counter
             WHERE t1.status != t2.status
             GROUP BY t1.status
-        """, (counter_range_start, counter_range_end, counter_range_start, counter_range_end))
-        _ = cur.fetchall()
+        """, (counter_range_start, counter_range_end, counter_range_start, counter_range_end), "drain")
     except Exception:
         # Ignore rare deadlocks in concurrent scenarios
         pass
 
     # === PART 5: Metadata operations (metadata, locks) ===
-    if random.random() < 0.3:  # 30% chance to avoid excessive DDL
+    if rand_float() < 0.3:  # 30% chance to avoid excessive DDL
         try:
             # Start transaction to create metadata lock
             if not cfg.autocommit:
-                cur.execute("START TRANSACTION")
+                yield BEGIN
 
             # DDL operation (metadata locks)
-            cur.execute("SELECT * FROM test_metadata FOR UPDATE")
-            _ = cur.fetchall()
+            yield Step("SELECT * FROM test_metadata FOR UPDATE", fetch="drain")
 
-            # Hold lock briefly
-            time.sleep(0.3)
+            # Hold lock briefly, server-side so the session keeps it
+            yield Step(_SQL_DO_SLEEP, (0.3,))
 
-            if not cfg.autocommit:
-                cur.execute("COMMIT")
+            yield COMMIT
         except Exception:
             pass
 
     # === PART 6: Bytes sent/received (traffic metrics) ===
     # Large result set to generate traffic
-    cur.execute("SELECT * FROM test_load LIMIT 100")
-    _ = cur.fetchall()
+    yield Step("SELECT * FROM test_load LIMIT 100", fetch="drain")
 
     # Commit all changes
-    if not cfg.autocommit:
-        try:
-            conn.commit()
-        except mariadb.OperationalError:
-            conn.rollback()
+    yield COMMIT
 
 
-WORKLOADS: dict[str, Callable] = {
+WORKLOADS: dict[str, Callable[[Config], Workload]] = {
     "basic": workload_basic,
     "mixed": workload_mixed,
     "stress": workload_stress,
@@ -669,94 +1047,380 @@ WORKLOADS: dict[str, Callable] = {
 
 
 # ============================================================================
-# WORKER EXECUTION
+# ASYNC DRIVER (--async-driver)
 # ============================================================================
+# Runs the workloads above on asyncmy/aiomysql.
 
-def sync_worker(worker_id: int, cfg: Config, stop_event: threading.Event | None = None) -> bool:
-    """Execute one worker connection lifecycle."""
-    max_retries = 60 if cfg.persistent else 1  # Retry for 60s in persistent mode
-    retry_delay = 1.0  # 1 second between retries
+@functools.lru_cache(maxsize=None)
+def to_pyformat(sql: str) -> str:
+    """Convert qmark placeholders to the pyformat style used by the async drivers."""
+    return sql.replace("%", "%%").replace("?", "%s")
+
+
+async def resolve(value):
+    """Await value if the driver returned an awaitable."""
+    return await value if inspect.isawaitable(value) else value
+
+
+class AsyncCursor:
+    """Async cursor taking the sync workloads' qmark SQL and timing execute()."""
+
+    __slots__ = ("_cur", "_hist")
+
+    def __init__(self, cur: aiomysql.Cursor, hist: LogHist) -> None:
+        self._cur = cur
+        self._hist = hist
+
+    async def execute(self, sql: str, params: tuple | None = None) -> None:
+        """Execute qmark SQL in the driver's pyformat and record its latency."""
+        t0 = time.perf_counter_ns()
+        if params is None:
+            await self._cur.execute(sql)
+        else:
+            await self._cur.execute(to_pyformat(sql), params)
+        self._hist.record(time.perf_counter_ns() - t0)
+
+    # asyncmy's fetch methods are coroutines, aiomysql's buffered ones are
+    # plain functions returning a future or the rows, so both go through resolve()
+    async def fetchone(self) -> tuple | None:
+        return await resolve(self._cur.fetchone())
+
+    async def fetchall(self) -> list[tuple]:
+        return await resolve(self._cur.fetchall())
 
-    for attempt in range(max_retries):
-        conn = None
+    async def drain(self) -> None:
+        # The async drivers build the row tuples while reading the result,
+        # so skipping them is no cheaper than fetching them
+        await resolve(self._cur.fetchall())
+
+
+async def async_commit(conn: aiomysql.Connection, cfg: Config) -> None:
+    """Commit unless autocommit is enabled, rolling back on conflicts."""
+    if not cfg.autocommit:
         try:
-            conn = connect(cfg)
-            cur = conn.cursor()
+            await conn.commit()
+        except ASYNC_OPERATIONAL_ERRORS:
+            await conn.rollback()
+
 
-            if attempt > 0:
-                print(f"[{worker_id}] Connected after {attempt} retries ({cfg.workload_type} workload)")
+async def run_async_workload(steps: Workload, cur: AsyncCursor, conn: aiomysql.Connection,
+                             cfg: Config) -> None:
+    """Run a workload's steps on an async driver connection, like run_workload()."""
+    try:
+        step = next(steps)
+        while True:
+            try:
+                if step is COMMIT:
+                    await async_commit(conn, cfg)
+                    result = None
+                elif step is BEGIN:
+                    await conn.begin()
+                    result = None
+                else:
+                    await cur.execute(step.sql, step.params)
+                    result = await getattr(cur, step.fetch)() if step.fetch else None
+            except Exception as e:
+                step = steps.throw(e)  # Re-raised here unless the workload catches it
             else:
-                print(f"[{worker_id}] Connected ({cfg.workload_type} workload)")
+                step = steps.send(result)
+    except StopIteration:
+        pass
+
+
+# ============================================================================
+# LATENCY HISTOGRAM
+# ============================================================================
+
+class LogHist:
+    """Per-worker query latency histogram; bucket b counts [2^b, 2^(b+1)) ns."""
+
+    __slots__ = ("bins",)
+
+    def __init__(self) -> None:
+        self.bins = array.array("Q", bytes(8 * 64))
+
+    def record(self, dt_ns: int) -> None:
+        """Count one sample of dt_ns nanoseconds."""
+        self.bins[min(63, max(dt_ns, 1).bit_length() - 1)] += 1
+
+    def merge(self, other: LogHist) -> None:
+        """Add another histogram's counts into this one."""
+        for b, count in enumerate(other.bins):
+            self.bins[b] += count
+
+    def count(self) -> int:
+        """Total number of samples recorded."""
+        return sum(self.bins)
+
+    def percentile(self, q: float) -> int:
+        """Upper bound, in ns, of the bucket holding the q-th percentile."""
+        rank = q / 100.0 * self.count()
+        seen = 0
+        for b, count in enumerate(self.bins):
+            seen += count
+            if count and seen >= rank:
+                return 1 << (b + 1)
+        return 0
+
+
+class TimedCursor:
+    """Cursor proxy recording execute() latency into a LogHist."""
+
+    __slots__ = ("_conn", "_stmts", "_text", "_cur", "_hist")
+
+    def __init__(self, conn: mariadb.Connection, stmts: dict[str, mariadb.Cursor], hist: LogHist) -> None:
+        self._conn = conn
+        self._stmts = stmts
+        self._text: mariadb.Cursor | None = None
+        self._cur: mariadb.Cursor | None = None
+        self._hist = hist
+
+    def _cursor(self, sql: str, params: tuple | list | None) -> mariadb.Cursor:
+        # A prepared cursor ignores any SQL but its first, so each parameterized
+        # statement keeps its own in stmts; parameterless SQL goes over the text
+        # protocol on one plain cursor. Fetches go to the cursor picked last.
+        if not params:
+            cur = self._text
+            if cur is None:
+                cur = self._text = self._conn.cursor()
+        else:
+            cur = self._stmts.get(sql)
+            if cur is None:
+                cur = self._stmts[sql] = self._conn.cursor(prepared=True)
+        self._cur = cur
+        return cur
+
+    def execute(self, sql: str, params: tuple | list | None = None) -> None:
+        cur = self._cursor(sql, params)
+        t0 = time.perf_counter_ns()
+        if params:
+            cur.execute(sql, params)
+        else:
+            cur.execute(sql)
+        self._hist.record(time.perf_counter_ns() - t0)
+
+    def drain(self) -> None:
+        """Discard a result that only matters for its traffic."""
+        if self._cur is self._text:
+            # nextset() frees text-protocol rows without building tuples, but a
+            # prepared cursor's stored rows survive it, so those are fetched
+            self._cur.nextset()
+        else:
+            self._cur.fetchall()
+
+    def __getattr__(self, name: str):
+        return getattr(self._cur, name)
 
-            workload_func = WORKLOADS.get(cfg.workload_type, workload_basic)
-            workload_func(cur, conn, cfg)
 
-            # In duration mode, hold connection until stop event is set
-            # In single-run mode, hold for configured time
-            if stop_event:
-                # Duration mode: hold connection until test ends
-                stop_event.wait()  # Block until event is set
+def run_workload(steps: Workload, cur: TimedCursor, conn: mariadb.Connection, cfg: Config) -> None:
+    """Run a workload's steps on a threaded worker's connection."""
+    try:
+        step = next(steps)
+        while True:
+            try:
+                if step is COMMIT:
+                    commit(conn, cfg)
+                    result = None
+                elif step is BEGIN:
+                    conn.begin()
+                    result = None
+                else:
+                    cur.execute(step.sql, step.params)
+                    result = getattr(cur, step.fetch)() if step.fetch else None
+            except Exception as e:
+                step = steps.throw(e)  # Re-raised here unless the workload catches it
             else:
-                # Single-run mode: hold for configured time
-                time.sleep(cfg.hold_time)
+                step = steps.send(result)
+    except StopIteration:
+        pass
 
-            cur.close()
-            conn.close()
-            print(f"[{worker_id}] Closed")
-            return True
 
-        except mariadb.OperationalError as e:
-            error_msg = str(e)
+# ============================================================================
+# WORKER EXECUTION
+# ============================================================================
 
-            # Close connection on error
-            if conn:
-                try:
-                    conn.close()
-                except Exception:
-                    pass
-
-            # Check if it's a connection limit error
-            if "Too many connections" in error_msg or "max_connections" in error_msg:
-                if cfg.persistent and attempt < max_retries - 1:
-                    if attempt == 0:
-                        print(f"[{worker_id}] Max connections reached, waiting for available slot...")
-                    time.sleep(retry_delay)
-                    continue  # Retry
+class StopPipe:
+    """Stop signal for parked duration-mode workers, woken all at once by a pipe's EOF."""
+
+    def __init__(self) -> None:
+        self._read_fd, self._write_fd = os.pipe()
+
+    def wait(self) -> None:
+        """Block until set() is called."""
+        os.read(self._read_fd, 1)  # Returns b"" once the write end is closed
+
+    def set(self) -> None:
+        """Wake every waiter at once, unlike threading.Event's one-by-one notify_all()."""
+        if self._write_fd is not None:
+            os.close(self._write_fd)
+            self._write_fd = None
+
+    def close(self) -> None:
+        """Wake any waiters and release both ends of the pipe."""
+        self.set()
+        os.close(self._read_fd)
+
+
+def build_worker(cfg: Config, pool: ConnectionPool,
+                 stop_event: StopPipe | None = None) -> Callable[[int, LogHist], bool]:
+    """Build the worker for this run, resolving everything fixed for the run only once."""
+    workload_func = WORKLOADS[cfg.workload_type]
+    connected_msg = f"({cfg.workload_type} workload)"
+    max_retries = 60 if cfg.persistent else 1  # Retry for 60s in persistent mode
+    retry_delay = 1.0  # 1 second between retries
+    persistent = cfg.persistent
+    db_errors = (mariadb.OperationalError, PoolExhausted)
+    sleep = time.sleep
+
+    # In duration mode, hold connection until the test ends
+    # In single-run mode, hold for configured time
+    hold = stop_event.wait if stop_event else functools.partial(sleep, cfg.hold_time)
+
+    def worker(worker_id: int, hist: LogHist) -> bool:
+        """Execute one worker connection lifecycle."""
+        for attempt in range(max_retries):
+            conn = None
+            try:
+                conn = pool.acquire()
+                # Each parameterized statement runs on a prepared cursor the pool caches per connection
+                cur = TimedCursor(conn, pool.statements(conn), hist)
+
+                if attempt > 0:
+                    log(f"[{worker_id}] Connected after {attempt} retries {connected_msg}")
+                else:
+                    log(f"[{worker_id}] Connected {connected_msg}")
+
+                run_workload(workload_func(cfg), cur, conn, cfg)
+                hold()
+
+                pool.release(conn)  # Cached cursors stay open with the connection
+                log(f"[{worker_id}] Closed")
+                return True
+
+            except db_errors as e:
+                error_msg = str(e)
+
+                # Close connection on error
+                if conn:
+                    pool.discard(conn)
+
+                # Check if it's a connection limit error
+                if (isinstance(e, PoolExhausted) or
+                        "Too many connections" in error_msg or "max_connections" in error_msg):
+                    if persistent and attempt < max_retries - 1:
+                        if attempt == 0:
+                            log(f"[{worker_id}] Max connections reached, waiting for available slot...")
+                        sleep(retry_delay)
+                        continue  # Retry
+                    else:
+                        log(f"[{worker_id}] FAILED (max_connections reached)", err=True)
+                        return False
                 else:
-                    print(f"[{worker_id}] FAILED (max_connections reached)", file=sys.stderr)
+                    # Other operational errors (replication conflicts, etc.)
+                    log(f"[{worker_id}] FAILED (OperationalError): {error_msg}", err=True)
                     return False
-            else:
-                # Other operational errors (replication conflicts, etc.)
-                print(f"[{worker_id}] FAILED (OperationalError): {error_msg}", file=sys.stderr)
+
+            except Exception as e:
+                # Close connection on unexpected error
+                if conn:
+                    pool.discard(conn)
+
+                log(f"[{worker_id}] FAILED (Unexpected): {e}", err=True)
                 return False
 
-        except Exception as e:
-            # Close connection on unexpected error
-            if conn:
+        # Exhausted all retries
+        log(f"[{worker_id}] FAILED (gave up after {max_retries} retries)", err=True)
+        return False
+
+    return worker
+
+
+def build_native_worker(cfg: Config, pool: aiomysql.Pool, sem: asyncio.Semaphore,
+                        stop_event: asyncio.Event | None, abort: asyncio.Event | None):
+    """Build the asyncio worker for this run (--async-driver), like build_worker()."""
+    workload_func = WORKLOADS[cfg.workload_type]
+    connected_msg = f"({cfg.workload_type} workload)"
+    max_retries = 60 if cfg.persistent else 1  # Retry for 60s in persistent mode
+    retry_delay = 1.0  # 1 second between retries
+    persistent = cfg.persistent
+    db_errors = ASYNC_OPERATIONAL_ERRORS
+    hold = stop_event.wait if stop_event else functools.partial(asyncio.sleep, cfg.hold_time)
+
+    async def worker(worker_id: int, hist: LogHist, start_at: float | None = None) -> bool | None:
+        """Execute one worker connection lifecycle as an asyncio task."""
+        # start_at is the task's time.monotonic() slot in the ramp; an abort
+        # before then returns None without connecting
+        if start_at is not None:
+            delay = start_at - time.monotonic()
+            if delay > 0:
+                if abort is None:
+                    await asyncio.sleep(delay)
+                else:
+                    with contextlib.suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(abort.wait(), delay)  # Woken early by abort
+        if abort is not None and abort.is_set():
+            return None
+
+        async with sem:
+            for attempt in range(max_retries):
                 try:
-                    conn.close()
-                except Exception:
-                    pass
+                    async with pool.acquire() as conn:
+                        async with conn.cursor() as raw_cur:
+                            if attempt > 0:
+                                log(f"[{worker_id}] Connected after {attempt} retries {connected_msg}")
+                            else:
+                                log(f"[{worker_id}] Connected {connected_msg}")
+
+                            await run_async_workload(workload_func(cfg), AsyncCursor(raw_cur, hist), conn, cfg)
+                            await hold()
+
+                    log(f"[{worker_id}] Closed")
+                    return True
+
+                except db_errors as e:
+                    error_msg = str(e)
+                    if "Too many connections" in error_msg or "max_connections" in error_msg:
+                        if persistent and attempt < max_retries - 1:
+                            if attempt == 0:
+                                log(f"[{worker_id}] Max connections reached, waiting for available slot...")
+                            await asyncio.sleep(retry_delay)
+                            continue  # Retry
+                        log(f"[{worker_id}] FAILED (max_connections reached)", err=True)
+                        return False
+                    log(f"[{worker_id}] FAILED (OperationalError): {error_msg}", err=True)
+                    return False
 
-            print(f"[{worker_id}] FAILED (Unexpected): {e}", file=sys.stderr)
-            return False
+                except Exception as e:
+                    log(f"[{worker_id}] FAILED (Unexpected): {e}", err=True)
+                    return False
+
+        log(f"[{worker_id}] FAILED (gave up after {max_retries} retries)", err=True)
+        return False
 
-    # Exhausted all retries
-    print(f"[{worker_id}] FAILED (gave up after {max_retries} retries)", file=sys.stderr)
-    return False
+    return worker
 
 
-async def async_worker(worker_id: int, cfg: Config, executor: concurrent.futures.ThreadPoolExecutor, stop_event: threading.Event | None = None) -> bool:
-    """Async wrapper for sync worker."""
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(executor, sync_worker, worker_id, cfg, stop_event)
+@contextlib.asynccontextmanager
+async def open_async_workers(cfg: Config, stop_event: asyncio.Event | None, hists: list[LogHist],
+                             abort: asyncio.Event):
+    """Yield a factory creating worker i's coroutine with its own LogHist, appended to hists."""
+    pool = await create_async_pool(cfg)
+    worker = build_native_worker(cfg, pool, asyncio.Semaphore(cfg.workers), stop_event, abort)
+    try:
+        def spawn(i: int, start_at: float | None = None):
+            hists.append(hist := LogHist())
+            return worker(i, hist, start_at)
+        yield spawn
+    finally:
+        pool.close()
+        await pool.wait_closed()
 
 
 # ============================================================================
 # TEST ORCHESTRATION
 # ============================================================================
 
-def setup_signal_handlers(stop_event: asyncio.Event) -> None:
+def setup_signal_handlers(stop_event: threading.Event | asyncio.Event) -> None:
     """Setup SIGINT/SIGTERM handlers."""
     def handle_signal(signum, _frame):
         print(f"\n[CTRL] Received signal {signum}; stopping...")
@@ -779,12 +1443,27 @@ def print_summary(attempted: int, successful: int, failed: int, duration: float)
     print("========================\n")
 
 
-async def run_single_test(cfg: Config) -> tuple[int, int, float]:
-    """Run single test (default mode)."""
-    ensure_test_tables(cfg)
+def print_latency(hists: list[LogHist]) -> None:
+    """Merge per-worker histograms and print query latency percentiles."""
+    total = LogHist()
+    for hist in hists:
+        total.merge(hist)
+    if not total.count():
+        return
+
+    print("===== QUERY LATENCY (bucket upper bound) =====")
+    print(f"Queries:         {total.count()}")
+    for q in (50, 90, 99, 100):
+        label = "max" if q == 100 else f"p{q}"
+        print(f"{label + ':':<17}{total.percentile(q) / 1e6:.3f}ms")
+    print("==============================================\n")
+
+
+def start_single_test(cfg: Config) -> None:
+    """Prepare tables and print the single-run header."""
+    max_conns = bootstrap(cfg)
 
     # Show connection info for exhaustion testing
-    max_conns = get_max_connections(cfg)
     if cfg.workload_type == "connection_exhaustion":
         print(f"[INFO] MariaDB max_connections: {max_conns}")
         if cfg.workers >= max_conns:
@@ -795,118 +1474,237 @@ async def run_single_test(cfg: Config) -> tuple[int, int, float]:
             print(f"[WARN] Consider --workers {max_conns + 10} to exceed limit")
 
     persistent_msg = " | persistent=true" if cfg.persistent else ""
+    driver_msg = f"driver={cfg.async_driver}" if cfg.async_driver else f"threads={cfg.max_threads}"
     print(f"[INIT] Starting {cfg.workers} workers | workload={cfg.workload_type} | "
-          f"burst={cfg.burst_mode} | ramp={cfg.ramp_ms}ms | threads={cfg.max_threads}{persistent_msg}")
+          f"burst={cfg.burst_mode} | ramp={cfg.ramp_ms}ms | {driver_msg}{persistent_msg}")
 
-    executor = concurrent.futures.ThreadPoolExecutor(max_workers=cfg.max_threads)
-    stop = asyncio.Event()
-    setup_signal_handlers(stop)
-
-    tasks: list[asyncio.Task[bool]] = []
-    start = time.time()
 
-    try:
-        for i in range(cfg.workers):
-            if stop.is_set():
-                break
-            tasks.append(asyncio.create_task(async_worker(i, cfg, executor, None)))  # No stop event in single-run
-            if not cfg.burst_mode:
-                delay = cfg.ramp_ms / 1000.0
-                if cfg.jitter_ms > 0:
-                    delay += random.randint(0, cfg.jitter_ms) / 1000.0
-                await asyncio.sleep(delay)
+def start_duration_test(cfg: Config) -> None:
+    """Prepare tables and print the duration-mode header."""
+    max_conns = bootstrap(cfg)
+    print(f"[INFO] MariaDB max_connections: {max_conns}")
+    print(f"[INIT] Duration mode: {cfg.duration}s total")
+    print(f"[INIT] Step size: {cfg.step_size} connections every {cfg.step_interval}s")
+    persistent_msg = " | persistent retries enabled" if cfg.persistent else ""
+    print(f"[INIT] Target max: {cfg.workers} workers | workload={cfg.workload_type}{persistent_msg}")
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-    finally:
-        executor.shutdown(wait=True)
 
+def finish_test(attempted: int, results: list, start: float, hists: list[LogHist]) -> tuple[int, int, float]:
+    """Tally worker results and print the summary."""
     successful = sum(1 for r in results if r is True)
     failed = len(results) - successful
     duration = round(time.time() - start, 2)
 
-    print_summary(len(tasks), successful, failed, duration)
+    flush_log()  # Worker lines first, then the summary
+    print_summary(attempted, successful, failed, duration)
+    print_latency(hists)
     return successful, failed, duration
 
 
-async def run_duration_test(cfg: Config) -> tuple[int, int, float]:
-    """Run duration-based test with stepped ramp-up."""
-    ensure_test_tables(cfg)
+def ramp_delay(cfg: Config) -> float:
+    """Seconds to wait before starting the next worker."""
+    delay = cfg.ramp_ms / 1000.0
+    if cfg.jitter_ms > 0:
+        delay += rand_int(0, cfg.jitter_ms) / 1000.0
+    return delay
 
-    max_conns = get_max_connections(cfg)
-    print(f"[INFO] MariaDB max_connections: {max_conns}")
-    print(f"[INIT] Duration mode: {cfg.duration}s total")
-    print(f"[INIT] Step size: {cfg.step_size} connections every {cfg.step_interval}s")
-    persistent_msg = " | persistent retries enabled" if cfg.persistent else ""
-    print(f"[INIT] Target max: {cfg.workers} workers | workload={cfg.workload_type}{persistent_msg}")
 
-    executor = concurrent.futures.ThreadPoolExecutor(max_workers=cfg.max_threads)
-    stop = asyncio.Event()
-    worker_stop = threading.Event()  # Threading event for workers
+def ramp_schedule(t0: float, count: int, next_delay: Callable[[], float]) -> list[float]:
+    """Absolute start times for count workers, the first at t0, each next_delay() after the last."""
+    if count <= 0:
+        return []
+    return list(itertools.accumulate((next_delay() for _ in range(count - 1)), initial=t0))
+
+
+def run_single_test(cfg: Config) -> tuple[int, int, float]:
+    """Run single test (default mode)."""
+    start_single_test(cfg)
+
+    stop = threading.Event()
+    setup_signal_handlers(stop)
+
+    hists = [LogHist() for _ in range(cfg.workers)]
+    start = time.time()
+
+    with contextlib.closing(create_pool(cfg)) as pool, \
+            concurrent.futures.ThreadPoolExecutor(max_workers=cfg.max_threads) as executor:
+        worker = build_worker(cfg, pool)  # No stop event in single-run
+        if cfg.burst_mode:
+            results = list(executor.map(worker, range(cfg.workers), hists))
+        else:
+            futures = []
+            for i in range(cfg.workers):
+                if stop.is_set():
+                    break
+                futures.append(executor.submit(worker, i, hists[i]))
+                time.sleep(ramp_delay(cfg))
+            results = [f.result() for f in concurrent.futures.as_completed(futures)]
+
+    return finish_test(len(results), results, start, hists)
+
+
+def run_duration_test(cfg: Config) -> tuple[int, int, float]:
+    """Run duration-based test with stepped ramp-up."""
+    start_duration_test(cfg)
+
+    stop = threading.Event()
     setup_signal_handlers(stop)
 
-    all_tasks: list[asyncio.Task[bool]] = []
+    hists: list[LogHist] = []
+    futures: list[concurrent.futures.Future[bool]] = []
     start_time = time.time()
     current_workers = 0
     step_number = 0
 
-    try:
-        while time.time() - start_time < cfg.duration and not stop.is_set():
-            # Calculate workers for this step
-            target_workers = min((step_number + 1) * cfg.step_size, cfg.workers)
-            new_workers = target_workers - current_workers
-
-            if new_workers > 0:
-                print(f"\n[STEP {step_number + 1}] Adding {new_workers} connections "
-                      f"(total: {target_workers}/{cfg.workers})")
-
-                for i in range(current_workers, target_workers):
-                    if stop.is_set():
-                        break
-                    all_tasks.append(asyncio.create_task(async_worker(i, cfg, executor, worker_stop)))  # Pass threading event
-                    if not cfg.burst_mode:
-                        await asyncio.sleep(cfg.ramp_ms / 1000.0)
-
-                current_workers = target_workers
-
-            step_number += 1
-
-            # Wait for next step
-            if current_workers < cfg.workers:
-                remaining = cfg.duration - (time.time() - start_time)
-                wait_time = min(cfg.step_interval, remaining)
-                if wait_time > 0:
-                    await asyncio.sleep(wait_time)
-            else:
-                # Reached max, hold until duration ends
-                remaining = cfg.duration - (time.time() - start_time)
-                if remaining > 0:
-                    print(f"\n[INFO] Max workers reached, holding for {remaining:.1f}s...")
-                    await asyncio.sleep(remaining)
-                break
+    # worker_stop is released when the test ends
+    with contextlib.closing(StopPipe()) as worker_stop, contextlib.closing(create_pool(cfg)) as pool, \
+            concurrent.futures.ThreadPoolExecutor(max_workers=cfg.max_threads) as executor:
+        worker = build_worker(cfg, pool, worker_stop)
+        try:
+            while time.time() - start_time < cfg.duration and not stop.is_set():
+                # Calculate workers for this step
+                target_workers = min((step_number + 1) * cfg.step_size, cfg.workers)
+                new_workers = target_workers - current_workers
+
+                if new_workers > 0:
+                    print(f"\n[STEP {step_number + 1}] Adding {new_workers} connections "
+                          f"(total: {target_workers}/{cfg.workers})")
+
+                    for i in range(current_workers, target_workers):
+                        if stop.is_set():
+                            break
+                        hists.append(hist := LogHist())
+                        futures.append(executor.submit(worker, i, hist))
+                        if not cfg.burst_mode:
+                            time.sleep(cfg.ramp_ms / 1000.0)
+
+                    current_workers = target_workers
+
+                step_number += 1
+
+                # Wait for next step (wakes early on SIGINT/SIGTERM)
+                if current_workers < cfg.workers:
+                    remaining = cfg.duration - (time.time() - start_time)
+                    wait_time = min(cfg.step_interval, remaining)
+                    if wait_time > 0:
+                        stop.wait(wait_time)
+                else:
+                    # Reached max, hold until duration ends
+                    remaining = cfg.duration - (time.time() - start_time)
+                    if remaining > 0:
+                        print(f"\n[INFO] Max workers reached, holding for {remaining:.1f}s...")
+                        stop.wait(remaining)
+                    break
 
-        print(f"\n[INFO] Duration complete, signaling workers to close...")
-        worker_stop.set()  # Signal all workers to close their connections
+            print(f"\n[INFO] Duration complete, signaling workers to close...")
+            worker_stop.set()  # Signal all workers to close their connections
 
-        results = await asyncio.gather(*all_tasks, return_exceptions=True)
+            results = [f.result() for f in concurrent.futures.as_completed(futures)]
 
-    finally:
-        worker_stop.set()  # Ensure it's set even if interrupted
-        executor.shutdown(wait=True)
+        finally:
+            worker_stop.set()  # Ensure it's set even if interrupted
 
-    successful = sum(1 for r in results if r is True)
-    failed = len(results) - successful
-    duration = round(time.time() - start_time, 2)
+    return finish_test(len(futures), results, start_time, hists)
 
-    print_summary(len(all_tasks), successful, failed, duration)
-    return successful, failed, duration
 
+async def run_async_single_test(cfg: Config) -> tuple[int, int, float]:
+    """Run single test on the native asyncio driver."""
+    start_single_test(cfg)
+
+    stop = asyncio.Event()
+    setup_signal_handlers(stop)
+
+    hists: list[LogHist] = []
+    start = time.time()
 
-async def run_test(cfg: Config) -> tuple[int, int, float]:
-    """Run test (routes to single or duration mode)."""
+    async with open_async_workers(cfg, None, hists, abort=stop) as spawn:  # No stop event in single-run
+        # Every task is created up front and sleeps until its own ramp slot,
+        # so the loop arms one timer per worker instead of pacing creation
+        if cfg.burst_mode:
+            tasks = [asyncio.create_task(spawn(i)) for i in range(cfg.workers)]
+        else:
+            schedule = ramp_schedule(time.monotonic(), cfg.workers, functools.partial(ramp_delay, cfg))
+            tasks = [asyncio.create_task(spawn(i, at)) for i, at in enumerate(schedule)]
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = [r for r in results if r is not None]  # Drop workers skipped by a stop signal
+    return finish_test(len(results), results, start, hists)
+
+
+async def run_async_duration_test(cfg: Config) -> tuple[int, int, float]:
+    """Run duration-based test with stepped ramp-up on the native asyncio driver."""
+    start_duration_test(cfg)
+
+    stop = asyncio.Event()
+    worker_stop = asyncio.Event()  # Released when the test ends
+    setup_signal_handlers(stop)
+
+    all_tasks: list[asyncio.Task[bool | None]] = []
+    hists: list[LogHist] = []
+    start_time = time.time()
+    current_workers = 0
+    step_number = 0
+
+    async with open_async_workers(cfg, worker_stop, hists, abort=worker_stop) as spawn:
+        try:
+            while time.time() - start_time < cfg.duration and not stop.is_set():
+                # Calculate workers for this step
+                target_workers = min((step_number + 1) * cfg.step_size, cfg.workers)
+                new_workers = target_workers - current_workers
+
+                if new_workers > 0:
+                    print(f"\n[STEP {step_number + 1}] Adding {new_workers} connections "
+                          f"(total: {target_workers}/{cfg.workers})")
+
+                    ramp = 0.0 if cfg.burst_mode else cfg.ramp_ms / 1000.0
+                    schedule = ramp_schedule(time.monotonic(), new_workers, lambda: ramp)
+                    all_tasks.extend(asyncio.create_task(spawn(i, at))
+                                     for i, at in zip(range(current_workers, target_workers), schedule))
+
+                    current_workers = target_workers
+
+                step_number += 1
+
+                # Wait for next step
+                if current_workers < cfg.workers:
+                    remaining = cfg.duration - (time.time() - start_time)
+                    wait_time = min(cfg.step_interval, remaining)
+                    if wait_time > 0:
+                        await asyncio.sleep(wait_time)
+                else:
+                    # Reached max, hold until duration ends
+                    remaining = cfg.duration - (time.time() - start_time)
+                    if remaining > 0:
+                        print(f"\n[INFO] Max workers reached, holding for {remaining:.1f}s...")
+                        await asyncio.sleep(remaining)
+                    break
+
+            print(f"\n[INFO] Duration complete, signaling workers to close...")
+            worker_stop.set()  # Signal all workers to close their connections
+
+            results = await asyncio.gather(*all_tasks, return_exceptions=True)
+
+        finally:
+            worker_stop.set()  # Ensure it's set even if interrupted
+
+    results = [r for r in results if r is not None]  # Drop workers still waiting for their ramp slot
+    return finish_test(len(results), results, start_time, hists)
+
+
+def run_test(cfg: Config) -> tuple[int, int, float]:
+    """Run test (routes to single or duration mode on the configured driver)."""
+    if cfg.async_driver:
+        runner = run_async_duration_test if cfg.duration > 0 else run_async_single_test
+        if uvloop is not None:
+            if hasattr(uvloop, "run"):
+                return uvloop.run(runner(cfg))
+            uvloop.install()  # uvloop < 0.18 has no run(); set its loop policy instead
+        return asyncio.run(runner(cfg))
     if cfg.duration > 0:
-        return await run_duration_test(cfg)
+        return run_duration_test(cfg)
     else:
-        return await run_single_test(cfg)
+        return run_single_test(cfg)
 
 
 # ============================================================================
@@ -928,7 +1726,8 @@ def main() -> None:
         print(f"Mode: Single run (hold {cfg.hold_time}s)")
     print("="*60 + "\n")
 
-    asyncio.run(run_test(cfg))
+    start_log_writer()
+    run_test(cfg)
 
 
 if __name__ == "__main__":